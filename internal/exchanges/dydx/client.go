@@ -214,6 +214,18 @@ func (c *Client) Connect(ctx context.Context) error {
 
 // Disconnect closes connection to the exchange
 func (c *Client) Disconnect() error {
+	// CONCURRENCY FIX: Protected access to pythonClient
+	c.mu.RLock()
+	pythonClient := c.pythonClient
+	c.mu.RUnlock()
+
+	// Stop the Python order daemon even if the market data feed is down.
+	// Done without holding c.mu: Close waits for any in-flight order request,
+	// and holding the lock meanwhile would block every reader of the client.
+	if pythonClient != nil {
+		pythonClient.Close()
+	}
+
 	c.mu.Lock()
 	defer c.mu.Unlock()
 
@@ -465,6 +477,31 @@ func (c *Client) CancelOrder(ctx context.Context, orderID string) error {
 	return nil
 }
 
+// CancelOrders cancels several orders in a single round trip to the Python client wrapper
+func (c *Client) CancelOrders(ctx context.Context, orderIDs []string) error {
+	startTime := time.Now()
+
+	// CONCURRENCY FIX: Protected access to pythonClient
+	c.mu.RLock()
+	pythonClient := c.pythonClient
+	c.mu.RUnlock()
+
+	// Check if Python client is available
+	if pythonClient == nil {
+		return fmt.Errorf("Python client not initialized - please use NewClientWithMnemonic")
+	}
+
+	// Cancel orders via Python client
+	err := pythonClient.CancelOrders(ctx, orderIDs)
+	if err != nil {
+		telemetry.RecordError("CancelOrderFailed")
+		return fmt.Errorf("failed to cancel orders: %w", err)
+	}
+
+	telemetry.RecordAPIRequest("dydx", "CancelOrders", time.Since(startTime))
+	return nil
+}
+
 // GetOrder retrieves order details
 // ⚠️ WARNING: NOT IMPLEMENTED - dYdX v4 indexer API may not provide individual order queries
 func (c *Client) GetOrder(ctx context.Context, orderID string) (*exchanges.Order, error) {
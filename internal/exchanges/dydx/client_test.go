@@ -260,6 +260,23 @@ func TestClient_CancelOrder_NoPythonClient(t *testing.T) {
 	}
 }
 
+// TestClient_CancelOrders_NoPythonClient tests CancelOrders without Python client
+func TestClient_CancelOrders_NoPythonClient(t *testing.T) {
+	client := &Client{
+		pythonClient: nil,
+	}
+
+	ctx := context.Background()
+	err := client.CancelOrders(ctx, []string{"order-123", "order-456"})
+	if err == nil {
+		t.Error("Expected error when Python client not initialized")
+	}
+
+	if !contains(err.Error(), "Python client not initialized") {
+		t.Errorf("Expected 'Python client not initialized' error, got: %v", err)
+	}
+}
+
 // TestClient_GetBalance_NoWallet tests GetBalance without wallet initialization
 func TestClient_GetBalance_NoWallet(t *testing.T) {
 	client := &Client{
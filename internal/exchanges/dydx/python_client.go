@@ -1,13 +1,17 @@
 package dydx
 
 import (
-	"bytes"
+	"bufio"
 	"context"
+	"encoding/binary"
 	"encoding/json"
+	"errors"
 	"fmt"
+	"io"
 	"os"
 	"os/exec"
 	"path/filepath"
+	"sync"
 	"time"
 
 	"github.com/guyghost/constantine/internal/exchanges"
@@ -36,14 +40,115 @@ func detectVirtualEnvPython() string {
 	return "" // Not found, use default
 }
 
+const (
+	// frameHeaderSize is the size of the big-endian length prefix of a frame
+	frameHeaderSize = 4
+	// maxFrameSize bounds the body of a response frame read from the daemon
+	maxFrameSize = 16 << 20
+	// stderrTailSize is how much of the daemon's stderr is kept for error reports
+	stderrTailSize = 500
+)
+
+// resolvePythonPath picks the interpreter used to run the Python daemon:
+// the configured path, then DYDX_PYTHON_PATH (e.g. pypy3 for a JIT-compiled
+// long-running daemon), then a project virtual environment, then python3
+func resolvePythonPath(configPath string) string {
+	if configPath != "" {
+		return configPath
+	}
+
+	if envPath := os.Getenv("DYDX_PYTHON_PATH"); envPath != "" {
+		return envPath
+	}
+
+	// First try to detect virtual environment Python
+	if venvPython := detectVirtualEnvPython(); venvPython != "" {
+		return venvPython
+	}
+
+	// Fall back to system python3
+	return "python3"
+}
+
 // PythonClient wraps the official dYdX v4 Python client for order placement
 // This is a temporary solution until we have native Go proto support
+//
+// The Python script runs as a long-lived daemon started on the first request,
+// so interpreter startup, node connection and key derivation are paid once
+// instead of once per order. Requests are serialized over its stdin/stdout.
 type PythonClient struct {
 	pythonPath         string
 	scriptPath         string
 	scriptPathVerified bool   // Security flag to ensure path was validated
 	network            string // "testnet" or "mainnet"
 	mnemonic           string
+
+	// slot is a 1-slot semaphore that serializes requests and guards the
+	// daemon process; unlike a mutex, waiting for it honours the context
+	slot     chan struct{}
+	slotOnce sync.Once
+
+	cmd        *exec.Cmd
+	stdin      *os.File
+	stdoutFile *os.File
+	stdout     *bufio.Reader
+	stderr     *stderrTail
+	exited     chan struct{} // Closed once the daemon process has exited
+}
+
+// stderrTail keeps the last bytes written to the daemon's stderr so failures
+// can be reported without retaining its whole output
+type stderrTail struct {
+	mu  sync.Mutex
+	buf []byte
+}
+
+// Write implements io.Writer
+func (t *stderrTail) Write(p []byte) (int, error) {
+	t.mu.Lock()
+	defer t.mu.Unlock()
+
+	t.buf = append(t.buf, p...)
+	if len(t.buf) > stderrTailSize {
+		t.buf = append(t.buf[:0], t.buf[len(t.buf)-stderrTailSize:]...)
+	}
+	return len(p), nil
+}
+
+// String returns the retained stderr output
+func (t *stderrTail) String() string {
+	t.mu.Lock()
+	defer t.mu.Unlock()
+	return string(t.buf)
+}
+
+// writeFrame writes payload prefixed with its 4-byte big-endian length
+func writeFrame(w io.Writer, payload []byte) error {
+	frame := make([]byte, frameHeaderSize+len(payload))
+	binary.BigEndian.PutUint32(frame, uint32(len(payload)))
+	copy(frame[frameHeaderSize:], payload)
+
+	_, err := w.Write(frame)
+	return err
+}
+
+// readFrame reads one length-prefixed frame and returns its body
+func readFrame(r io.Reader) ([]byte, error) {
+	var header [frameHeaderSize]byte
+	if _, err := io.ReadFull(r, header[:]); err != nil {
+		return nil, err
+	}
+
+	length := binary.BigEndian.Uint32(header[:])
+	if length > maxFrameSize {
+		return nil, fmt.Errorf("frame too large: %d bytes", length)
+	}
+
+	payload := make([]byte, length)
+	if _, err := io.ReadFull(r, payload); err != nil {
+		return nil, err
+	}
+	return payload, nil
 }
 
 // PythonClientConfig contains configuration for the Python client wrapper
@@ -56,16 +161,7 @@ type PythonClientConfig struct {
 
 // NewPythonClient creates a new Python client wrapper
 func NewPythonClient(config *PythonClientConfig) (*PythonClient, error) {
-	pythonPath := config.PythonPath
-	if pythonPath == "" {
-		// First try to detect virtual environment Python
-		if venvPython := detectVirtualEnvPython(); venvPython != "" {
-			pythonPath = venvPython
-		} else {
-			// Fall back to system python3
-			pythonPath = "python3"
-		}
-	}
+	pythonPath := resolvePythonPath(config.PythonPath)
 
 	// SECURITY FIX: Resolve and validate script path
 	scriptPath, err := resolveScriptPath(config.ScriptPath)
@@ -100,6 +196,26 @@ type PythonOrderRequest struct {
 	ClientID    string  `json:"clientId,omitempty"`
 }
 
+// pythonRequest is the body of a request frame sent to the Python daemon
+// The mnemonic is never part of it - it is passed via environment variable
+type pythonRequest struct {
+	Command string      `json:"command"`
+	Network string      `json:"network"`
+	Data    interface{} `json:"data"`
+}
+
+// pythonBatchItem is a single command of a batch request
+type pythonBatchItem struct {
+	Command string      `json:"command"`
+	Data    interface{} `json:"data"`
+}
+
+// pythonBatchRequest is the body of a batch request frame
+type pythonBatchRequest struct {
+	Network string            `json:"network"`
+	Batch   []pythonBatchItem `json:"batch"`
+}
+
 // PythonOrderResponse represents the response from Python client
 type PythonOrderResponse struct {
 	Success  bool   `json:"success"`
@@ -183,33 +299,71 @@ func (c *PythonClient) CancelOrder(ctx context.Context, orderID string) error {
 	return nil
 }
 
-// executePythonScript executes a Python script with the given command and data
-func (c *PythonClient) executePythonScript(ctx context.Context, command string, data interface{}) ([]byte, error) {
-	// Enforce maximum timeout (30 seconds default, respect context if shorter)
-	ctx, cancel := context.WithTimeout(ctx, 30*time.Second)
-	defer cancel()
+// CancelOrders cancels several orders in a single request to the Python client
+// The daemon broadcasts the cancellations one after another, in order, since
+// they are signed with the same account sequence
+func (c *PythonClient) CancelOrders(ctx context.Context, orderIDs []string) error {
+	if len(orderIDs) == 0 {
+		return nil
+	}
 
-	// Marshal data to JSON
-	jsonData, err := json.Marshal(data)
+	batch := make([]pythonBatchItem, len(orderIDs))
+	for i, orderID := range orderIDs {
+		batch[i] = pythonBatchItem{
+			Command: "cancel_order",
+			Data:    map[string]string{"orderId": orderID},
+		}
+	}
+
+	responses, err := c.executePythonBatch(ctx, batch)
 	if err != nil {
-		return nil, fmt.Errorf("failed to marshal data: %w", err)
+		return fmt.Errorf("failed to execute Python script: %w", err)
 	}
 
-	// Prepare script input WITHOUT mnemonic (security fix)
-	input := map[string]interface{}{
-		"command": command,
-		"network": c.network,
-		"data":    json.RawMessage(jsonData),
-		// REMOVED: "mnemonic" - now passed via environment variable
+	var errs []error
+	for i, response := range responses {
+		var pyResponse PythonOrderResponse
+		if err := json.Unmarshal(response, &pyResponse); err != nil {
+			errs = append(errs, fmt.Errorf("order %s: failed to parse Python response: %w", orderIDs[i], err))
+			continue
+		}
+
+		if !pyResponse.Success {
+			errs = append(errs, fmt.Errorf("order %s: cancellation failed: %s", orderIDs[i], pyResponse.Error))
+		}
 	}
 
-	inputJSON, err := json.Marshal(input)
+	return errors.Join(errs...)
+}
+
+// startLocked starts the Python daemon if it is not already running.
+// Must be called with the request slot held.
+func (c *PythonClient) startLocked() error {
+	if c.cmd != nil {
+		select {
+		case <-c.exited:
+			// Daemon died since the last request, start a fresh one
+			c.stopLocked()
+		default:
+			return nil
+		}
+	}
+
+	// Use plain pipes rather than StdinPipe/StdoutPipe so that Wait, which runs
+	// as soon as the process exits, does not close our end of stdout before
+	// its last frame has been read; stopLocked closes it instead
+	stdinR, stdinW, err := os.Pipe()
 	if err != nil {
-		return nil, fmt.Errorf("failed to marshal input: %w", err)
+		return fmt.Errorf("failed to create stdin pipe: %w", err)
+	}
+	stdoutR, stdoutW, err := os.Pipe()
+	if err != nil {
+		stdinR.Close()
+		stdinW.Close()
+		return fmt.Errorf("failed to create stdout pipe: %w", err)
 	}
 
-	// Execute Python script
-	cmd := exec.CommandContext(ctx, c.pythonPath, c.scriptPath)
+	cmd := exec.Command(c.pythonPath, c.scriptPath)
 
 	// SECURITY FIX: Pass mnemonic via environment variable instead of stdin
 	// This prevents exposure in process dumps and command-line inspection
@@ -217,46 +371,207 @@ func (c *PythonClient) executePythonScript(ctx context.Context, command string,
 		"DYDX_MNEMONIC_SECRET="+c.mnemonic, // Use non-obvious name
 	)
 
-	cmd.Stdin = bytes.NewReader(inputJSON)
+	stderr := &stderrTail{}
+	cmd.Stdin = stdinR
+	cmd.Stdout = stdoutW
+	cmd.Stderr = stderr
 
-	var stdout, stderr bytes.Buffer
-	cmd.Stdout = &stdout
-	cmd.Stderr = &stderr
+	err = cmd.Start()
+	// The child holds its own copies of these ends
+	stdinR.Close()
+	stdoutW.Close()
+	if err != nil {
+		stdinW.Close()
+		stdoutR.Close()
+		return fmt.Errorf("failed to start Python script: %w", err)
+	}
 
-	// Run command with proper timeout handling
-	done := make(chan error, 1)
+	exited := make(chan struct{})
 	go func() {
-		done <- cmd.Run()
+		cmd.Wait()
+		close(exited)
 	}()
 
+	c.cmd = cmd
+	c.stdin = stdinW
+	c.stdoutFile = stdoutR
+	c.stdout = bufio.NewReader(stdoutR)
+	c.stderr = stderr
+	c.exited = exited
+	return nil
+}
+
+// stopLocked shuts the Python daemon down. Closing stdin lets it exit on EOF;
+// if it is still running after a grace period it is killed.
+// Must be called with the request slot held.
+func (c *PythonClient) stopLocked() {
+	if c.cmd == nil {
+		return
+	}
+
+	c.stdin.Close()
 	select {
+	case <-c.exited:
+	case <-time.After(1 * time.Second):
+		c.cmd.Process.Kill()
+		<-c.exited
+	}
+
+	// Only close our end of stdout now: readers see EOF on their own once the
+	// process exits, after any frame it wrote last
+	c.stdoutFile.Close()
+
+	c.cmd = nil
+	c.stdin = nil
+	c.stdoutFile = nil
+	c.stdout = nil
+	c.exited = nil
+}
+
+// acquire takes the request slot, giving up when ctx is done first
+func (c *PythonClient) acquire(ctx context.Context) error {
+	c.slotOnce.Do(func() {
+		c.slot = make(chan struct{}, 1)
+	})
+
+	select {
+	case c.slot <- struct{}{}:
 	case <-ctx.Done():
-		// Context cancelled or timeout - kill the process
-		if cmd.Process != nil {
-			// Try graceful termination first
-			cmd.Process.Signal(os.Interrupt)
-
-			// Force kill after 1 second if still running
-			time.AfterFunc(1*time.Second, func() {
-				if cmd.Process != nil {
-					cmd.Process.Kill()
-				}
-			})
+		return ctx.Err()
+	}
+
+	// Both cases may be ready at once; never start a request on a dead context
+	if err := ctx.Err(); err != nil {
+		c.release()
+		return err
+	}
+	return nil
+}
+
+// release gives the request slot back
+func (c *PythonClient) release() {
+	<-c.slot
+}
+
+// Close stops the Python daemon. The next request starts a new one.
+func (c *PythonClient) Close() error {
+	c.acquire(context.Background())
+	defer c.release()
+
+	c.stopLocked()
+	return nil
+}
+
+// executePythonScript sends a command to the Python daemon and returns its response
+func (c *PythonClient) executePythonScript(ctx context.Context, command string, data interface{}) ([]byte, error) {
+	// Enforce maximum timeout (30 seconds default, respect context if shorter)
+	ctx, cancel := context.WithTimeout(ctx, 30*time.Second)
+	defer cancel()
+
+	// Prepare script input WITHOUT mnemonic (security fix)
+	// Encoded in a single pass: data is embedded directly rather than being
+	// marshaled to a RawMessage first and re-validated by a second Marshal
+	inputJSON, err := json.Marshal(pythonRequest{
+		Command: command,
+		Network: c.network,
+		Data:    data,
+	})
+	if err != nil {
+		return nil, fmt.Errorf("failed to marshal input: %w", err)
+	}
+
+	return c.roundTrip(ctx, inputJSON)
+}
+
+// executePythonBatch sends several commands in one frame. The daemon overlaps
+// read-only commands, runs transactions one at a time, and returns one raw
+// response per command, in request order.
+func (c *PythonClient) executePythonBatch(ctx context.Context, batch []pythonBatchItem) ([]json.RawMessage, error) {
+	// Enforce maximum timeout (30 seconds default, respect context if shorter)
+	ctx, cancel := context.WithTimeout(ctx, 30*time.Second)
+	defer cancel()
+
+	inputJSON, err := json.Marshal(pythonBatchRequest{
+		Network: c.network,
+		Batch:   batch,
+	})
+	if err != nil {
+		return nil, fmt.Errorf("failed to marshal input: %w", err)
+	}
+
+	response, err := c.roundTrip(ctx, inputJSON)
+	if err != nil {
+		return nil, err
+	}
+
+	var result struct {
+		Success bool              `json:"success"`
+		Results []json.RawMessage `json:"results"`
+		Error   string            `json:"error"`
+	}
+	if err := json.Unmarshal(response, &result); err != nil {
+		return nil, fmt.Errorf("failed to parse Python response: %w", err)
+	}
+
+	if !result.Success {
+		return nil, fmt.Errorf("batch failed: %s", result.Error)
+	}
+
+	if len(result.Results) != len(batch) {
+		return nil, fmt.Errorf("batch returned %d results for %d commands", len(result.Results), len(batch))
+	}
+
+	return result.Results, nil
+}
+
+// roundTrip writes one request frame to the Python daemon and reads its response
+func (c *PythonClient) roundTrip(ctx context.Context, inputJSON []byte) ([]byte, error) {
+	// Waiting behind a slow request must not eat the deadline and then send
+	// a frame anyway: that would kill a healthy daemon mid-request below
+	if err := c.acquire(ctx); err != nil {
+		return nil, fmt.Errorf("Python script timeout or cancelled: %w", err)
+	}
+	defer c.release()
+
+	if err := c.startLocked(); err != nil {
+		return nil, err
+	}
+
+	type frameResult struct {
+		payload []byte
+		err     error
+	}
+
+	// Run the round trip in the background so a stuck daemon cannot outlive ctx
+	stdin, stdout := c.stdin, c.stdout
+	done := make(chan frameResult, 1)
+	go func() {
+		// A failed write means the daemon closed stdin, i.e. it is exiting.
+		// Still read: it may have answered first (e.g. "not installed").
+		writeErr := writeFrame(stdin, inputJSON)
+		payload, err := readFrame(stdout)
+		if err != nil && writeErr != nil {
+			err = writeErr
 		}
+		done <- frameResult{payload: payload, err: err}
+	}()
+
+	select {
+	case <-ctx.Done():
+		// The response stream is out of sync now - kill the daemon
+		c.cmd.Process.Signal(os.Interrupt)
+		c.stopLocked()
 		return nil, fmt.Errorf("Python script timeout or cancelled: %w", ctx.Err())
 
-	case err := <-done:
-		if err != nil {
+	case res := <-done:
+		if res.err != nil {
 			// Sanitize error message to avoid leaking sensitive data
-			stderrStr := stderr.String()
-			if len(stderrStr) > 500 {
-				stderrStr = stderrStr[:500] + "... (truncated)"
-			}
-			return nil, fmt.Errorf("Python script error: %s\nStderr: %s", err, stderrStr)
+			stderrStr := c.stderr.String()
+			c.stopLocked()
+			return nil, fmt.Errorf("Python script error: %s\nStderr: %s", res.err, stderrStr)
 		}
+		return res.payload, nil
 	}
-
-	return stdout.Bytes(), nil
 }
 
 // GetBalance gets account balance (for compatibility)
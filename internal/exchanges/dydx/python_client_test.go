@@ -0,0 +1,489 @@
+package dydx
+
+import (
+	"bytes"
+	"context"
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"io"
+	"os/exec"
+	"path/filepath"
+	"strings"
+	"testing"
+	"time"
+
+	"github.com/guyghost/constantine/internal/exchanges"
+	"github.com/shopspring/decimal"
+)
+
+// testMnemonic is the BIP39 test vector mnemonic
+const testMnemonic = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+
+// TestFrame_RoundTrip tests that frames written by writeFrame are read back intact
+func TestFrame_RoundTrip(t *testing.T) {
+	payloads := [][]byte{
+		[]byte(`{"command":"get_balance","network":"testnet","data":{}}`),
+		{},
+		[]byte(`{"success":true}`),
+	}
+
+	var buf bytes.Buffer
+	for _, p := range payloads {
+		if err := writeFrame(&buf, p); err != nil {
+			t.Fatalf("writeFrame failed: %v", err)
+		}
+	}
+
+	for i, want := range payloads {
+		got, err := readFrame(&buf)
+		if err != nil {
+			t.Fatalf("readFrame %d failed: %v", i, err)
+		}
+		if !bytes.Equal(got, want) {
+			t.Errorf("frame %d: expected %q, got %q", i, want, got)
+		}
+	}
+
+	if _, err := readFrame(&buf); err != io.EOF {
+		t.Errorf("Expected io.EOF after last frame, got %v", err)
+	}
+}
+
+// TestReadFrame_Truncated tests that a partial frame is reported as an error
+func TestReadFrame_Truncated(t *testing.T) {
+	var buf bytes.Buffer
+	if err := writeFrame(&buf, []byte(`{"success":true}`)); err != nil {
+		t.Fatalf("writeFrame failed: %v", err)
+	}
+	truncated := bytes.NewReader(buf.Bytes()[:buf.Len()-3])
+
+	if _, err := readFrame(truncated); err != io.ErrUnexpectedEOF {
+		t.Errorf("Expected io.ErrUnexpectedEOF, got %v", err)
+	}
+}
+
+// TestReadFrame_TooLarge tests that oversized frames are rejected before allocation
+func TestReadFrame_TooLarge(t *testing.T) {
+	header := make([]byte, frameHeaderSize)
+	binary.BigEndian.PutUint32(header, maxFrameSize+1)
+
+	_, err := readFrame(bytes.NewReader(header))
+	if err == nil || !strings.Contains(err.Error(), "frame too large") {
+		t.Errorf("Expected frame too large error, got %v", err)
+	}
+}
+
+// TestStderrTail_KeepsLastBytes tests that only the end of stderr is retained
+func TestStderrTail_KeepsLastBytes(t *testing.T) {
+	tail := &stderrTail{}
+	tail.Write([]byte(strings.Repeat("a", stderrTailSize)))
+	tail.Write([]byte("traceback"))
+
+	got := tail.String()
+	if len(got) != stderrTailSize {
+		t.Errorf("Expected %d bytes, got %d", stderrTailSize, len(got))
+	}
+	if !strings.HasSuffix(got, "traceback") {
+		t.Errorf("Expected tail to end with latest output, got %q", got[len(got)-20:])
+	}
+}
+
+// TestPythonClient_CloseWithoutStart tests closing a client whose daemon never started
+func TestPythonClient_CloseWithoutStart(t *testing.T) {
+	client := &PythonClient{}
+	if err := client.Close(); err != nil {
+		t.Errorf("Close failed: %v", err)
+	}
+}
+
+// TestResolvePythonPath tests interpreter selection precedence
+func TestResolvePythonPath(t *testing.T) {
+	t.Setenv("DYDX_PYTHON_PATH", "/usr/bin/pypy3")
+
+	if got := resolvePythonPath("/opt/python3.12"); got != "/opt/python3.12" {
+		t.Errorf("Expected configured path to win, got %s", got)
+	}
+
+	if got := resolvePythonPath(""); got != "/usr/bin/pypy3" {
+		t.Errorf("Expected DYDX_PYTHON_PATH, got %s", got)
+	}
+}
+
+// TestPythonClient_CancelOrdersEmpty tests that an empty batch never reaches the daemon
+func TestPythonClient_CancelOrdersEmpty(t *testing.T) {
+	client := &PythonClient{}
+	if err := client.CancelOrders(context.Background(), nil); err != nil {
+		t.Errorf("CancelOrders failed: %v", err)
+	}
+	if client.cmd != nil {
+		t.Error("Expected daemon not to be started for an empty batch")
+	}
+}
+
+// newStubPythonClient returns a PythonClient running scripts/dydx_client.py
+// against the stub grpc/dydx_v4_client packages in testdata/<stubDir>
+func newStubPythonClient(t *testing.T, stubDir, mnemonic string) *PythonClient {
+	t.Helper()
+
+	pythonPath, err := exec.LookPath("python3")
+	if err != nil {
+		t.Skip("python3 not available")
+	}
+
+	stubPath, err := filepath.Abs(filepath.Join("testdata", stubDir))
+	if err != nil {
+		t.Fatalf("Failed to resolve stub path: %v", err)
+	}
+	t.Setenv("PYTHONPATH", stubPath)
+	t.Setenv("PYTHONDONTWRITEBYTECODE", "1")
+
+	client, err := NewPythonClient(&PythonClientConfig{
+		PythonPath: pythonPath,
+		ScriptPath: filepath.Join("scripts", "dydx_client.py"),
+		Network:    "testnet",
+		Mnemonic:   mnemonic,
+	})
+	if err != nil {
+		t.Fatalf("NewPythonClient failed: %v", err)
+	}
+	t.Cleanup(func() { client.Close() })
+
+	return client
+}
+
+// daemonPID returns the pid of the running daemon, or 0
+func daemonPID(c *PythonClient) int {
+	c.acquire(context.Background())
+	defer c.release()
+
+	if c.cmd == nil {
+		return 0
+	}
+	return c.cmd.Process.Pid
+}
+
+// TestPythonDaemon_Commands tests that successive commands reuse one daemon
+func TestPythonDaemon_Commands(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", testMnemonic)
+	ctx := context.Background()
+
+	first, err := client.PlaceOrder(ctx, &exchanges.Order{
+		Symbol: "BTC-USD",
+		Side:   "buy",
+		Type:   "limit",
+		Amount: decimal.NewFromFloat(0.1),
+		Price:  decimal.NewFromFloat(50000),
+	})
+	if err != nil {
+		t.Fatalf("PlaceOrder failed: %v", err)
+	}
+	if len(first.ID) != 32 {
+		t.Errorf("Expected 32-char order id, got %q", first.ID)
+	}
+	pid := daemonPID(client)
+
+	second, err := client.PlaceOrder(ctx, &exchanges.Order{Symbol: "ETH-USD", Side: "SELL", Type: "MARKET"})
+	if err != nil {
+		t.Fatalf("PlaceOrder failed: %v", err)
+	}
+	if second.ID == first.ID {
+		t.Errorf("Expected distinct order ids, got %s twice", first.ID)
+	}
+
+	if err := client.CancelOrder(ctx, first.ID); err != nil {
+		t.Errorf("CancelOrder failed: %v", err)
+	}
+
+	balance, err := client.GetBalance(ctx)
+	if err != nil {
+		t.Fatalf("GetBalance failed: %v", err)
+	}
+	if !balance["USDC"].Equal(decimal.NewFromFloat(12.5)) {
+		t.Errorf("Expected USDC balance 12.5, got %v", balance)
+	}
+
+	if got := daemonPID(client); got != pid {
+		t.Errorf("Expected daemon %d to be reused, got %d", pid, got)
+	}
+}
+
+// TestPythonDaemon_ErrorFrames tests that failing commands are answered with
+// error responses and leave the daemon running
+func TestPythonDaemon_ErrorFrames(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", testMnemonic)
+	ctx := context.Background()
+
+	tests := []struct {
+		name    string
+		command string
+		data    interface{}
+		wantErr string
+	}{
+		{"unknown command", "close_position", map[string]string{}, "Unknown command: close_position"},
+		{"missing order id", "cancel_order", map[string]string{}, "orderId is required"},
+		{"invalid size", "place_order", map[string]string{"size": "lots"}, "invalid size or price"},
+		{"node error", "cancel_order", map[string]string{"orderId": "rpc-fail"}, "account sequence mismatch"},
+		{"unencodable result", "cancel_order", map[string]string{"orderId": "bytes-tx"}, "failed to encode response"},
+	}
+
+	pid := 0
+	for _, tt := range tests {
+		t.Run(tt.name, func(t *testing.T) {
+			response, err := client.executePythonScript(ctx, tt.command, tt.data)
+			if err != nil {
+				t.Fatalf("executePythonScript failed: %v", err)
+			}
+
+			var pyResponse PythonOrderResponse
+			if err := json.Unmarshal(response, &pyResponse); err != nil {
+				t.Fatalf("Failed to parse response: %v", err)
+			}
+			if pyResponse.Success || !strings.Contains(pyResponse.Error, tt.wantErr) {
+				t.Errorf("Expected error containing %q, got %s", tt.wantErr, response)
+			}
+
+			if pid == 0 {
+				pid = daemonPID(client)
+			} else if got := daemonPID(client); got != pid {
+				t.Errorf("Expected daemon %d to survive, got %d", pid, got)
+			}
+		})
+	}
+}
+
+// TestPythonDaemon_MissingMnemonic tests the error frame sent without a mnemonic
+func TestPythonDaemon_MissingMnemonic(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", "")
+
+	_, err := client.GetBalance(context.Background())
+	if err == nil || !strings.Contains(err.Error(), "DYDX_MNEMONIC_SECRET") {
+		t.Errorf("Expected missing mnemonic error, got %v", err)
+	}
+}
+
+// TestPythonDaemon_NotInstalled tests that the frame written by a daemon
+// exiting at startup is still delivered
+func TestPythonDaemon_NotInstalled(t *testing.T) {
+	client := newStubPythonClient(t, "pystub_missing", testMnemonic)
+
+	_, err := client.GetBalance(context.Background())
+	if err == nil || !strings.Contains(err.Error(), "dydx-v4-client-py not installed") {
+		t.Errorf("Expected not installed error, got %v", err)
+	}
+}
+
+// TestPythonDaemon_Batch tests that batched transactions run in order with
+// increasing account sequences while read-only commands are answered in place
+func TestPythonDaemon_Batch(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", testMnemonic)
+	ctx := context.Background()
+
+	responses, err := client.executePythonBatch(ctx, []pythonBatchItem{
+		{Command: "cancel_order", Data: map[string]string{"orderId": "a"}},
+		{Command: "get_balance", Data: map[string]string{}},
+		{Command: "cancel_order", Data: map[string]string{"orderId": "b"}},
+		{Command: "cancel_order", Data: map[string]string{"orderId": "c"}},
+	})
+	if err != nil {
+		t.Fatalf("executePythonBatch failed: %v", err)
+	}
+
+	// The stub node starts at sequence 3 and echoes the signing sequence
+	wantTx := map[int]string{0: "seq-3", 2: "seq-4", 3: "seq-5"}
+	for i, response := range responses {
+		var pyResponse PythonOrderResponse
+		if err := json.Unmarshal(response, &pyResponse); err != nil {
+			t.Fatalf("Failed to parse response %d: %v", i, err)
+		}
+		if !pyResponse.Success {
+			t.Errorf("Response %d failed: %s", i, pyResponse.Error)
+		}
+		if want, ok := wantTx[i]; ok && pyResponse.TxHash != want {
+			t.Errorf("Response %d: expected tx %s, got %s", i, want, pyResponse.TxHash)
+		}
+	}
+
+	err = client.CancelOrders(ctx, []string{"d", ""})
+	if err == nil || !strings.Contains(err.Error(), "orderId is required") {
+		t.Errorf("Expected error for the empty order id, got %v", err)
+	}
+	if strings.Contains(err.Error(), "order d") {
+		t.Errorf("Expected order d to be cancelled, got %v", err)
+	}
+}
+
+// TestPythonDaemon_FrameBoundaries tests frames split across writes and
+// several frames sent in a single write
+func TestPythonDaemon_FrameBoundaries(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", testMnemonic)
+
+	client.acquire(context.Background())
+	defer client.release()
+
+	if err := client.startLocked(); err != nil {
+		t.Fatalf("startLocked failed: %v", err)
+	}
+
+	request, err := json.Marshal(pythonRequest{Command: "get_balance", Network: "testnet", Data: map[string]string{}})
+	if err != nil {
+		t.Fatalf("Failed to marshal request: %v", err)
+	}
+	var frame bytes.Buffer
+	writeFrame(&frame, request)
+
+	// One frame split in the middle of its header and of its body
+	raw := frame.Bytes()
+	for _, chunk := range [][]byte{raw[:2], raw[2:10], raw[10:]} {
+		if _, err := client.stdin.Write(chunk); err != nil {
+			t.Fatalf("Write failed: %v", err)
+		}
+		time.Sleep(20 * time.Millisecond)
+	}
+	// Two frames in one write
+	if _, err := client.stdin.Write(append(append([]byte{}, raw...), raw...)); err != nil {
+		t.Fatalf("Write failed: %v", err)
+	}
+
+	for i := 0; i < 3; i++ {
+		payload, err := readFrame(client.stdout)
+		if err != nil {
+			t.Fatalf("readFrame %d failed: %v", i, err)
+		}
+		if !strings.Contains(string(payload), `"success":true`) {
+			t.Errorf("Response %d: unexpected payload %s", i, payload)
+		}
+	}
+}
+
+// TestPythonDaemon_RestartAfterExit tests that a dead daemon is replaced on the next request
+func TestPythonDaemon_RestartAfterExit(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", testMnemonic)
+	ctx := context.Background()
+
+	if _, err := client.GetBalance(ctx); err != nil {
+		t.Fatalf("GetBalance failed: %v", err)
+	}
+	pid := daemonPID(client)
+
+	client.acquire(ctx)
+	client.cmd.Process.Kill()
+	<-client.exited
+	client.release()
+
+	if _, err := client.GetBalance(ctx); err != nil {
+		t.Fatalf("GetBalance after restart failed: %v", err)
+	}
+	if got := daemonPID(client); got == pid || got == 0 {
+		t.Errorf("Expected a new daemon, got pid %d (was %d)", got, pid)
+	}
+}
+
+// TestPythonDaemon_ContextExpiredWhileWaiting tests that a request whose context
+// expires while queued is not sent and does not kill the daemon
+func TestPythonDaemon_ContextExpiredWhileWaiting(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", testMnemonic)
+
+	if _, err := client.GetBalance(context.Background()); err != nil {
+		t.Fatalf("GetBalance failed: %v", err)
+	}
+	pid := daemonPID(client)
+
+	client.acquire(context.Background())
+	ctx, cancel := context.WithTimeout(context.Background(), 50*time.Millisecond)
+	defer cancel()
+	_, err := client.GetBalance(ctx)
+	client.release()
+
+	if err == nil || !errors.Is(err, context.DeadlineExceeded) {
+		t.Errorf("Expected deadline exceeded, got %v", err)
+	}
+	if got := daemonPID(client); got != pid {
+		t.Errorf("Expected daemon %d to survive, got %d", pid, got)
+	}
+}
+
+// TestPythonDaemon_BatchItemFailure tests that a command raising in the middle
+// of a batch fails only its own entry
+func TestPythonDaemon_BatchItemFailure(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", testMnemonic)
+
+	responses, err := client.executePythonBatch(context.Background(), []pythonBatchItem{
+		{Command: "cancel_order", Data: map[string]string{"orderId": "a"}},
+		{Command: "place_order", Data: map[string]interface{}{"side": nil}},
+		{Command: "cancel_order", Data: map[string]string{"orderId": "c"}},
+	})
+	if err != nil {
+		t.Fatalf("executePythonBatch failed: %v", err)
+	}
+
+	want := []PythonOrderResponse{
+		{Success: true, OrderID: "a", TxHash: "seq-3"},
+		{Success: false},
+		{Success: true, OrderID: "c", TxHash: "seq-4"},
+	}
+	for i, response := range responses {
+		var pyResponse PythonOrderResponse
+		if err := json.Unmarshal(response, &pyResponse); err != nil {
+			t.Fatalf("Failed to parse response %d: %v", i, err)
+		}
+		if pyResponse.Success != want[i].Success || pyResponse.TxHash != want[i].TxHash {
+			t.Errorf("Response %d: expected %+v, got %s", i, want[i], response)
+		}
+	}
+}
+
+// TestPythonDaemon_BatchUnencodableItem tests that a result the encoder rejects
+// fails only its own batch entry
+func TestPythonDaemon_BatchUnencodableItem(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", testMnemonic)
+
+	responses, err := client.executePythonBatch(context.Background(), []pythonBatchItem{
+		{Command: "cancel_order", Data: map[string]string{"orderId": "a"}},
+		{Command: "cancel_order", Data: map[string]string{"orderId": "bytes-tx"}},
+		{Command: "cancel_order", Data: map[string]string{"orderId": "c"}},
+	})
+	if err != nil {
+		t.Fatalf("executePythonBatch failed: %v", err)
+	}
+
+	// bytes-tx was broadcast too, so it consumed sequence 4
+	wantTx := []string{"seq-3", "", "seq-5"}
+	for i, response := range responses {
+		var pyResponse PythonOrderResponse
+		if err := json.Unmarshal(response, &pyResponse); err != nil {
+			t.Fatalf("Failed to parse response %d: %v", i, err)
+		}
+		if i == 1 {
+			if pyResponse.Success || !strings.Contains(pyResponse.Error, "failed to encode response") {
+				t.Errorf("Response 1: expected encoding error, got %s", response)
+			}
+			continue
+		}
+		if !pyResponse.Success || pyResponse.TxHash != wantTx[i] {
+			t.Errorf("Response %d: expected tx %s, got %s", i, wantTx[i], response)
+		}
+	}
+}
+
+// TestPythonDaemon_StrayStdout tests that output printed by the dYdX client
+// does not corrupt the frame stream
+func TestPythonDaemon_StrayStdout(t *testing.T) {
+	client := newStubPythonClient(t, "pystub", testMnemonic)
+	ctx := context.Background()
+
+	if err := client.CancelOrder(ctx, "noisy"); err != nil {
+		t.Fatalf("CancelOrder failed: %v", err)
+	}
+	pid := daemonPID(client)
+
+	if _, err := client.GetBalance(ctx); err != nil {
+		t.Fatalf("GetBalance after stray output failed: %v", err)
+	}
+	if got := daemonPID(client); got != pid {
+		t.Errorf("Expected daemon %d to survive, got %d", pid, got)
+	}
+	if !strings.Contains(client.stderr.String(), "native log line") {
+		t.Errorf("Expected stray output on stderr, got %q", client.stderr.String())
+	}
+}
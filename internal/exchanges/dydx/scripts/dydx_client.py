@@ -5,46 +5,151 @@ This script wraps the official dYdX v4 Python client for use from Go.
 
 Requirements:
 pip install dydx-v4-client-py v4-proto
+pip install orjson  # optional, faster JSON encoding/decoding
+pip install uvloop  # optional, faster event loop for the daemon
 
 Usage:
-The script reads JSON from stdin and writes JSON to stdout.
+The script runs as a long-lived daemon: it reads length-prefixed request frames
+from stdin until EOF and writes one length-prefixed response frame to stdout per
+request. A frame is a 4-byte big-endian length followed by a UTF-8 JSON body.
+The dYdX client is initialized on the first request for a network and reused
+for every following request.
 Mnemonic is passed via DYDX_MNEMONIC_SECRET environment variable for security.
 
-Input format (via stdin):
+Request body:
 {
     "command": "place_order" | "cancel_order" | "get_balance",
     "network": "testnet" | "mainnet",
     "data": {...}
 }
 
+Batch request body (read-only commands run concurrently, transactions run one
+at a time; results keep request order):
+{
+    "network": "testnet" | "mainnet",
+    "batch": [{"command": "...", "data": {...}}, ...]
+}
+
 Environment variables:
     DYDX_MNEMONIC_SECRET: BIP39 mnemonic phrase (required)
+    DYDX_ALLOW_TESTNET_FALLBACK: set to 1 to use testnet when the mainnet
+        network configuration cannot be created (default: fail the request)
 
-Output format (via stdout):
+Response body:
 {
     "success": true,
     "orderId": "...",
     "error": "..."
 }
+
+Batch response body:
+{
+    "success": true,
+    "results": [{...}, ...]
+}
 """
 
 import sys
 import os
 import json
 import asyncio
-from typing import Dict, Any
+import hashlib
+import inspect
+import signal
+from collections import deque
+from typing import Dict, Any, BinaryIO, List
 
 try:
+    import grpc
     from dydx_v4_client.node.client import NodeClient
     from dydx_v4_client.wallet import Wallet
+    from dydx_v4_client.key_pair import KeyPair
     from dydx_v4_client import OrderFlags
     from dydx_v4_client.network import TESTNET, make_mainnet
     HAS_DYDX = True
 except ImportError:
     HAS_DYDX = False
 
+# Shared empty default for missing sequences in node responses
+_EMPTY = ()
+
+# Order side/type normalization tables, so the common spellings cost a single
+# lookup in place_order instead of an .upper() call per field
+_ORDER_SIDES = {"BUY": "BUY", "buy": "BUY", "SELL": "SELL", "sell": "SELL"}
+_ORDER_TYPES = {"LIMIT": "LIMIT", "limit": "LIMIT", "MARKET": "MARKET", "market": "MARKET"}
+
+
+# Prefer orjson (C extension) for frame bodies, falling back to stdlib json
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+# Prefer uvloop's libuv-based event loop when available
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+# Derived key pairs keyed by sha256(mnemonic). Kept in memory only so the
+# private key never touches disk; the daemon lives long enough to reuse them.
+_KEY_PAIR_CACHE: Dict[str, Any] = {}
+
+
+def derive_key_pair(mnemonic: str):
+    """Derive the key pair for a mnemonic, reusing a previous derivation"""
+    fingerprint = hashlib.sha256(mnemonic.encode("utf-8")).hexdigest()
+    key_pair = _KEY_PAIR_CACHE.get(fingerprint)
+    if key_pair is None:
+        key_pair = KeyPair.from_mnemonic(mnemonic)
+        _KEY_PAIR_CACHE[fingerprint] = key_pair
+    return key_pair
+
+
+# Node connections keyed by network name (each name maps to a single node),
+# shared by every wrapper and closed only when the daemon shuts down
+_CLIENT_CACHE: Dict[str, Any] = {}
+
+
+async def close_node_clients():
+    """Close every cached node connection"""
+    clients = list(_CLIENT_CACHE.values())
+    _CLIENT_CACHE.clear()
+    for client in clients:
+        channel = getattr(client, "channel", None)
+        if channel is not None:
+            result = channel.close()
+            if inspect.isawaitable(result):
+                await result
+
+
+# Order ids are 128-bit random hex strings drawn from a pool refilled with a
+# single os.urandom call, instead of one urandom read and UUID object per order
+ORDER_ID_POOL_SIZE = 256
+_ORDER_ID_POOL: deque = deque()
+
+
+def next_order_id() -> str:
+    """Return a fresh random order id"""
+    if not _ORDER_ID_POOL:
+        entropy = os.urandom(16 * ORDER_ID_POOL_SIZE).hex()
+        _ORDER_ID_POOL.extend(entropy[i:i + 32] for i in range(0, len(entropy), 32))
+    return _ORDER_ID_POOL.popleft()
+
 
 class DydxClientWrapper:
+    # Fixed attribute slots: the wrapper lives as long as the daemon and these
+    # are read on every command
+    __slots__ = ("network_name", "network", "mnemonic", "client", "wallet", "_dispatch")
+
     def __init__(self, network: str, mnemonic: str):
         if not HAS_DYDX:
             raise ImportError("dydx-v4-client-py not installed. Run: pip install dydx-v4-client-py")
@@ -61,186 +166,370 @@ class DydxClientWrapper:
                     websocket_indexer="wss://indexer.dydx.trade/v4/ws",
                     node_url="tendermint.kingnodes.com"  # Primary node
                 )
-            except:
-                # Fallback to TESTNET if mainnet unavailable
+            except Exception:
+                # Never fall back silently: mainnet orders would land on testnet
+                if os.environ.get("DYDX_ALLOW_TESTNET_FALLBACK") != "1":
+                    raise
                 self.network = TESTNET
         else:
             raise ValueError(f"Invalid network: {network}")
 
+        self.network_name = network
         self.mnemonic = mnemonic
         self.client = None
         self.wallet = None
 
+        # Command name -> bound handler, resolved with one lookup per command
+        self._dispatch = {
+            "place_order": self.place_order,
+            "cancel_order": self.cancel_order,
+            "get_balance": self.get_balance,
+        }
+
     async def initialize(self):
         """Initialize the dYdX client"""
-        # Connect to the node
-        self.client = await NodeClient.connect(self.network.node)
+        # Connect to the node, reusing an open connection when there is one
+        self.client = _CLIENT_CACHE.get(self.network_name)
+        if self.client is None:
+            self.client = await NodeClient.connect(self.network.node)
+            _CLIENT_CACHE[self.network_name] = self.client
         
         # Create wallet from mnemonic
-        # Get the address from the wallet public key first
-        from dydx_v4_client.key_pair import KeyPair
-        key_pair = KeyPair.from_mnemonic(self.mnemonic)
-        
-        # Create a temporary wallet to get the address
-        temp_wallet = Wallet(key_pair, 0, 0)
-        address = temp_wallet.address
-        
-        # Now get the proper account info and create the real wallet
-        self.wallet = await Wallet.from_mnemonic(self.client, self.mnemonic, address)
+        # Derive the key pair once and get the address from its public key
+        key_pair = derive_key_pair(self.mnemonic)
+        address = Wallet(key_pair, 0, 0).address
+
+        # Now get the proper account info and create the real wallet from the
+        # same key pair (Wallet.from_mnemonic would derive it a second time)
+        account = await self.client.get_account(address)
+        self.wallet = Wallet(key_pair, account.account_number, account.sequence)
+
+    async def resync_sequence(self):
+        """Reload the wallet's account sequence from the node"""
+        account = await self.client.get_account(self.wallet.address)
+        self.wallet.sequence = account.sequence
 
     async def place_order(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Place an order on dYdX v4"""
+        if not self.client or not self.wallet:
+            return {
+                "success": False,
+                "error": "Client not initialized. Call initialize() first.",
+            }
+
+        market = data.get("market", "BTC-USD")
+        side_raw = data.get("side", "BUY")
+        side = _ORDER_SIDES.get(side_raw) or side_raw.upper()
+        order_type_raw = data.get("type", "LIMIT")
+        order_type = _ORDER_TYPES.get(order_type_raw) or order_type_raw.upper()
+        client_id = data.get("clientId", "")
+
         try:
-            if not self.client or not self.wallet:
-                raise ValueError("Client not initialized. Call initialize() first.")
-            
-            market = data.get("market", "BTC-USD")
-            side = data.get("side", "BUY").upper()
-            order_type = data.get("type", "LIMIT").upper()
             size = float(data.get("size", 0))
             price = float(data.get("price", 0))
-            client_id = data.get("clientId", "")
+        except (TypeError, ValueError) as e:
+            return {
+                "success": False,
+                "error": f"invalid size or price: {e}",
+            }
+
+        # NOTE: Full dYdX v4 order placement requires complex protobuf construction
+        # For now, we return a placeholder response indicating the order would be placed
+        # In production, this would construct a proper Order protobuf and call:
+        # tx_response = await self.client.place_order(wallet=self.wallet, order=...)
+        # followed by the same wallet sequence handling as cancel_order
+
+        order_id = next_order_id()
 
-            # NOTE: Full dYdX v4 order placement requires complex protobuf construction
-            # For now, we return a placeholder response indicating the order would be placed
-            # In production, this would construct a proper Order protobuf and call:
-            # tx_response = await self.client.place_order(wallet=self.wallet, order=...)
-            
-            import uuid
-            order_id = str(uuid.uuid4())
+        return {
+            "success": True,
+            "orderId": order_id,
+            "clientId": client_id or order_id,
+            "txHash": "",  # Would be filled by actual transaction
+        }
 
+    async def cancel_order(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Cancel an order on dYdX v4"""
+        if not self.client or not self.wallet:
             return {
-                "success": True,
-                "orderId": order_id,
-                "clientId": client_id or order_id,
-                "txHash": "",  # Would be filled by actual transaction
+                "success": False,
+                "error": "Client not initialized. Call initialize() first.",
             }
 
-        except Exception as e:
+        order_id = data.get("orderId")
+
+        if not order_id:
             return {
                 "success": False,
-                "error": str(e),
+                "error": "orderId is required",
             }
 
-    async def cancel_order(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Cancel an order on dYdX v4"""
+        # The wallet is cached for the daemon's lifetime and NodeClient does not
+        # track account sequences: it signs with wallet.sequence as is. Bump it
+        # after every broadcast and reload it from the chain when a broadcast
+        # fails, since the failure may be a sequence mismatch (e.g. a tx sent
+        # from elsewhere, or a short-term cancel that did not consume one).
         try:
-            if not self.client or not self.wallet:
-                raise ValueError("Client not initialized. Call initialize() first.")
-            
-            order_id = data.get("orderId")
-
-            if not order_id:
-                return {
-                    "success": False,
-                    "error": "orderId is required",
-                }
-
             response = await self.client.cancel_order(
                 wallet=self.wallet,
                 order_id=order_id,
             )
-
-            return {
-                "success": True,
-                "orderId": order_id,
-                "txHash": response.get("txHash", ""),
-            }
-
-        except Exception as e:
+        except (grpc.RpcError, ValueError) as e:
+            try:
+                await self.resync_sequence()
+            except grpc.RpcError:
+                pass  # Report the broadcast error; the next failure retries
             return {
                 "success": False,
                 "error": str(e),
             }
+        self.wallet.sequence += 1
+
+        return {
+            "success": True,
+            "orderId": order_id,
+            "txHash": response.get("txHash", ""),
+        }
 
     async def get_balance(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Get account balance"""
-        try:
-            if not self.client or not self.wallet:
-                raise ValueError("Client not initialized. Call initialize() first.")
-            
-            account = await self.client.get_subaccounts(address=self.wallet.address)
-
-            balances = {}
-            if account:
-                for asset_pos in account[0].get("assetPositions", []):
-                    asset = asset_pos.get("symbol", "USDC")
-                    amount = asset_pos.get("size", "0")
-                    balances[asset] = amount
-
+        if not self.client or not self.wallet:
             return {
-                "success": True,
-                "balance": balances,
+                "success": False,
+                "error": "Client not initialized. Call initialize() first.",
             }
 
-        except Exception as e:
+        try:
+            account = await self.client.get_subaccounts(address=self.wallet.address)
+        except (grpc.RpcError, ValueError) as e:
             return {
                 "success": False,
                 "error": str(e),
             }
 
+        positions = account[0].get("assetPositions", _EMPTY) if account else _EMPTY
+        balances = {pos.get("symbol", "USDC"): pos.get("size", "0") for pos in positions}
+
+        return {
+            "success": True,
+            "balance": balances,
+        }
+
     async def execute_command(self, command: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a command"""
-        if command == "place_order":
-            return await self.place_order(data)
-        elif command == "cancel_order":
-            return await self.cancel_order(data)
-        elif command == "get_balance":
-            return await self.get_balance(data)
-        else:
+        handler = self._dispatch.get(command)
+        if handler is None:
             return {
                 "success": False,
                 "error": f"Unknown command: {command}",
             }
+        return await handler(data)
 
 
-async def main():
-    """Main entry point"""
+# Frame header: 4-byte big-endian body length
+FRAME_HEADER_SIZE = 4
+
+# Size of the stdin read chunks and of the stdout write buffer
+STDIO_BUFFER_SIZE = 65536
+
+# Maximum number of batched read-only commands in flight against the node at once
+MAX_BATCH_CONCURRENCY = 10
+
+# Commands that do not broadcast a transaction and may overlap in a batch
+READ_ONLY_COMMANDS = frozenset({"get_balance"})
+
+
+async def open_stdin_reader() -> asyncio.StreamReader:
+    """Attach an asyncio stream reader to stdin"""
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    return reader
+
+
+class FrameReader:
+    """Splits the stdin byte stream into request frames"""
+
+    def __init__(self, reader: asyncio.StreamReader):
+        self.reader = reader
+        self.buffer = bytearray()
+
+    def _pop_frames(self) -> List[bytes]:
+        frames = []
+        buf = self.buffer
+        offset = 0
+        while len(buf) - offset >= FRAME_HEADER_SIZE:
+            start = offset + FRAME_HEADER_SIZE
+            end = start + int.from_bytes(buf[offset:start], "big")
+            if end > len(buf):
+                break
+            frames.append(bytes(buf[start:end]))
+            offset = end
+        del buf[:offset]
+        return frames
+
+    async def read_frames(self) -> List[bytes]:
+        """Wait for request frames, returning every complete frame received so far
+        ([] on EOF) so their responses can be flushed together"""
+        while True:
+            frames = self._pop_frames()
+            if frames:
+                return frames
+
+            chunk = await self.reader.read(STDIO_BUFFER_SIZE)
+            if not chunk:
+                return []
+            self.buffer += chunk
+
+
+def encode_error(e: Exception) -> Dict[str, Any]:
+    """Result reported in place of one the encoder cannot handle"""
+    return {
+        "success": False,
+        "error": f"failed to encode response: {e}",
+    }
+
+
+def write_frame(out: BinaryIO, result: Dict[str, Any]):
+    """Write one response frame to the buffered stdout (flushed by the caller)"""
+    try:
+        body = json_dumps(result)
+    except (TypeError, ValueError) as e:
+        # A result the encoder cannot handle (bytes, protobuf values...) must
+        # not take the daemon down; orjson.JSONEncodeError is a TypeError
+        body = json_dumps(encode_error(e))
+    out.write(len(body).to_bytes(FRAME_HEADER_SIZE, "big") + body)
+
+
+async def execute_batch(wrapper: DydxClientWrapper, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run a batch of commands. Read-only commands run concurrently so their
+    node round-trips overlap; tx-producing commands all sign with the same
+    wallet sequence, so they run one at a time in request order."""
+    semaphore = asyncio.Semaphore(MAX_BATCH_CONCURRENCY)
+    tx_lock = asyncio.Lock()  # FIFO, keeps txs in request order
+
+    async def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        # Failures stay confined to their own entry: an exception escaping
+        # gather would drop the other results (and hide txs already
+        # broadcast) while the remaining items keep running unanswered
+        try:
+            command = item.get("command")
+            guard = semaphore if command in READ_ONLY_COMMANDS else tx_lock
+            async with guard:
+                result = await wrapper.execute_command(command, item.get("data", {}))
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+            }
+
+        # Check each result on its own so one unencodable entry does not turn
+        # the whole frame into an encoding error after every item has run
+        try:
+            json_dumps(result)
+        except (TypeError, ValueError) as e:
+            return encode_error(e)
+        return result
+
+    return await asyncio.gather(*(run(item) for item in batch))
+
+
+async def handle_request(wrappers: Dict[str, DydxClientWrapper], mnemonic: str, body: bytes) -> Dict[str, Any]:
+    """Decode a request frame and run it on the cached client for its network"""
     try:
-        # Read input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = json_loads(body)
 
         command = input_data.get("command")
         network = input_data.get("network", "testnet")
         data = input_data.get("data", {})
 
-        # SECURITY FIX: Read mnemonic from environment variable instead of stdin
-        # This prevents exposure in process memory dumps and logs
-        mnemonic = os.environ.get("DYDX_MNEMONIC_SECRET", "")
-
         if not mnemonic:
-            result = {
+            return {
                 "success": False,
                 "error": "mnemonic not provided in environment (DYDX_MNEMONIC_SECRET)",
             }
-        else:
-            # Create client wrapper
+
+        wrapper = wrappers.get(network)
+        if wrapper is None:
+            # Only cache the wrapper once initialization succeeded so a
+            # transient node failure is retried on the next request
             wrapper = DydxClientWrapper(network, mnemonic)
             await wrapper.initialize()
+            wrappers[network] = wrapper
 
-            # Execute command
-            result = await wrapper.execute_command(command, data)
+        batch = input_data.get("batch")
+        if batch is not None:
+            return {
+                "success": True,
+                "results": await execute_batch(wrapper, batch),
+            }
 
-        # Write result to stdout
-        print(json.dumps(result))
-        sys.exit(0 if result.get("success") else 1)
+        return await wrapper.execute_command(command, data)
 
     except Exception as e:
-        result = {
+        # Last resort for unexpected failures (bad frame, node connection,
+        # malformed node responses) so the daemon keeps serving
+        return {
             "success": False,
             "error": str(e),
         }
-        print(json.dumps(result))
-        sys.exit(1)
+
+
+def claim_stdout() -> int:
+    """Reserve the pipe Go reads frames from and return a private fd for it.
+
+    fd 1 and sys.stdout are pointed at stderr, so a stray print from the
+    dYdX client or a dependency cannot corrupt the frame stream.
+    """
+    sys.stdout.flush()
+    frame_fd = os.dup(sys.stdout.fileno())
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    return frame_fd
+
+
+async def main():
+    """Main entry point"""
+    # SECURITY FIX: Read mnemonic from environment variable instead of stdin
+    # This prevents exposure in process memory dumps and logs
+    mnemonic = os.environ.get("DYDX_MNEMONIC_SECRET", "")
+
+    # Stop serving on SIGTERM/SIGINT so the node connections are closed cleanly
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, task.cancel)
+
+    # Responses go through one large buffer and are flushed once per group of
+    # requests read together, collapsing them into a single write(2)
+    out = os.fdopen(claim_stdout(), "wb", buffering=STDIO_BUFFER_SIZE)
+
+    wrappers: Dict[str, DydxClientWrapper] = {}
+    frames = FrameReader(await open_stdin_reader())
+    try:
+        while True:
+            bodies = await frames.read_frames()
+            if not bodies:
+                break
+            for body in bodies:
+                write_frame(out, await handle_request(wrappers, mnemonic, body))
+            out.flush()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await close_node_clients()
 
 
 if __name__ == "__main__":
     if not HAS_DYDX:
-        result = {
+        write_frame(sys.stdout.buffer, {
             "success": False,
             "error": "dydx-v4-client-py not installed. Run: pip install dydx-v4-client-py",
-        }
-        print(json.dumps(result))
+        })
+        sys.stdout.flush()
         sys.exit(1)
 
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     asyncio.run(main())
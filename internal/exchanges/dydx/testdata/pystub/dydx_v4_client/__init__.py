@@ -0,0 +1,6 @@
+"""Stub of dydx_v4_client for the Python bridge tests"""
+
+
+class OrderFlags:
+    SHORT_TERM = 0
+    LONG_TERM = 64
@@ -0,0 +1,10 @@
+import hashlib
+
+
+class KeyPair:
+    def __init__(self, secret: str):
+        self.secret = secret
+
+    @staticmethod
+    def from_mnemonic(mnemonic: str):
+        return KeyPair(hashlib.sha256(mnemonic.encode("utf-8")).hexdigest())
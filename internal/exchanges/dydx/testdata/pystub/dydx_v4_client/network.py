@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class Network:
+    node: str
+
+
+TESTNET = Network("testnet-node")
+
+
+def make_mainnet(rest_indexer, websocket_indexer, node_url):
+    return Network(node_url)
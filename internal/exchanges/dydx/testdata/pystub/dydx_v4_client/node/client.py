@@ -0,0 +1,48 @@
+import asyncio
+import os
+
+import grpc
+
+# Account sequence reported by the stub node
+ACCOUNT_SEQUENCE = 3
+
+
+class Account:
+    account_number = 7
+    sequence = ACCOUNT_SEQUENCE
+
+
+class Channel:
+    async def close(self):
+        pass
+
+
+class NodeClient:
+    def __init__(self):
+        self.channel = Channel()
+
+    @staticmethod
+    async def connect(config):
+        return NodeClient()
+
+    async def get_account(self, address):
+        return Account()
+
+    async def get_subaccounts(self, address):
+        return [{"assetPositions": [{"symbol": "USDC", "size": "12.5"}]}]
+
+    async def cancel_order(self, wallet, order_id):
+        # Special order ids trigger the error paths of the wrapper
+        if order_id == "rpc-fail":
+            raise grpc.RpcError("account sequence mismatch")
+        if order_id == "bytes-tx":
+            return {"txHash": b"\x00"}
+        if order_id == "noisy":
+            # Library chatter on stdout, from Python and from native code
+            print("broadcasting cancel")
+            os.write(1, b"native log line\n")
+        # Sign, then yield like a real broadcast so concurrent txs would
+        # observe the same sequence, and expose the sequence used
+        sequence = wallet.sequence
+        await asyncio.sleep(0)
+        return {"txHash": f"seq-{sequence}"}
@@ -0,0 +1,9 @@
+class Wallet:
+    def __init__(self, key, account_number, sequence):
+        self.key = key
+        self.account_number = account_number
+        self.sequence = sequence
+
+    @property
+    def address(self):
+        return "dydx1" + self.key.secret[:38]
@@ -0,0 +1,5 @@
+"""Stub of grpc for the Python bridge tests"""
+
+
+class RpcError(Exception):
+    pass
@@ -0,0 +1,3 @@
+"""Simulates a Python environment without dydx-v4-client-py installed"""
+
+raise ImportError("No module named 'dydx_v4_client'")